@@ -22,23 +22,86 @@ PySimpleGUI >= 4.60 is recommended.
 
 from __future__ import annotations
 
-import copy
+import functools
+import secrets
 import sys
+import threading
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 try:
     import PySimpleGUI as sg
+    import tkinter.font as tkfont
 except ModuleNotFoundError:  # pragma: no cover - optional dependency
     sg = None  # type: ignore[assignment]
+    tkfont = None  # type: ignore[assignment]
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 #  Game‑state helpers (SKELETON ― plug your own implementation here)
 # ──────────────────────────────────────────────────────────────────────────────
 
-
-@dataclass
+# Zobrist keys: one 64‑bit random per (pit, count) pair plus a side‑to‑move
+# key.  163 count values covers every reachable pit load (162 kumalaks in the
+# whole game).  Lets the board keep an incrementally updated position hash for
+# transposition tables / repetition detection instead of hashing from scratch.
+_ZOBRIST = [[secrets.randbits(64) for _ in range(163)] for _ in range(18)]
+_ZOBRIST_TURN = secrets.randbits(64)
+
+
+# Sowing paths precomputed per (start pit, count): the inner loop iterates a
+# ready-made index tuple instead of doing modular arithmetic per kumalak.
+# 50 covers every pit load seen outside pathological endgames; larger loads
+# fall back to the modular walk.
+_SOW_MAX = 50
+_SOW_INDICES = [
+    [
+        tuple((start + 1 + k) % 18 for k in range(count))
+        for count in range(_SOW_MAX + 1)
+    ]
+    for start in range(18)
+]
+
+
+# Hot-path kernels.  These stay module-level and work only on primitive
+# arguments (buffer + ints, no self) so that once the real sowing/capture
+# rules land they can be compiled wholesale with Numba's @njit or Cython
+# without restructuring the board class — just decorate and go.
+
+def _apply_move_kernel(pits: bytearray, pit_index: int) -> None:
+    """Sow the kumalaks from *pit_index* around the ring, in place."""
+    # TODO: implement capture & tuzdyk rules
+    count = pits[pit_index]
+    pits[pit_index] = 0
+    if count <= _SOW_MAX:
+        for idx in _SOW_INDICES[pit_index][count]:
+            pits[idx] += 1
+    else:  # pragma: no cover - unreachable until captures concentrate stones
+        for k in range(count):
+            pits[(pit_index + 1 + k) % 18] += 1
+
+
+def _undo_move_kernel(pits: bytearray, pit_index: int, old_count: int) -> None:
+    """Reverse :func:`_apply_move_kernel` given the pit's pre-move count."""
+    if old_count <= _SOW_MAX:
+        for idx in _SOW_INDICES[pit_index][old_count]:
+            pits[idx] -= 1
+    else:  # pragma: no cover - see _apply_move_kernel
+        for k in range(old_count):
+            pits[(pit_index + 1 + k) % 18] -= 1
+    pits[pit_index] = old_count
+
+
+def _legal_moves_kernel(mask: int) -> List[int]:
+    """Expand a bitmask of playable pits into an index list, lowest first."""
+    moves = []
+    while mask:
+        moves.append((mask & -mask).bit_length() - 1)
+        mask &= mask - 1
+    return moves
+
+
+@dataclass(slots=True)
 class ToguzBoard:
     """Lightweight board model holding pit counts and kazans.
 
@@ -47,37 +110,151 @@ class ToguzBoard:
         pits[9‥17]  – top row, right‑to‑left (mirrored for natural display)
     """
 
-    pits: List[int] = field(default_factory=lambda: [9] * 18)
+    # A bytearray keeps the 18 counts in one contiguous buffer: indexing is
+    # identical to a list, but slicing (our `copy`) is a single C-level memcpy
+    # instead of an 18-pointer walk.  Counts fit a byte — the full game has
+    # only 162 kumalaks.
+    pits: bytearray = field(default_factory=lambda: bytearray([9] * 18))
     kazans: Tuple[int, int] = (0, 0)  # (current player, opponent)
     turn: int = 0  # 0 = Bottom side to move, 1 = Top side
+    # Memoized result of generate_legal_moves; the position is immutable
+    # between moves, so the list only needs computing once per board.
+    _legal_cache: Optional[List[int]] = field(
+        default=None, repr=False, compare=False
+    )
+    # Zobrist hash of the position; None means "compute from scratch" and is
+    # filled in by __post_init__.  apply_move/undo maintain it incrementally.
+    hash: Optional[int] = field(default=None, compare=False)
+    # 18-bit mask with bit i set iff pits[i] > 0, maintained incrementally
+    # alongside the hash so move generation never re-reads the pit array.
+    _nonempty_mask: Optional[int] = field(default=None, repr=False, compare=False)
+    # Preallocated diff stack for in-place search (make_move/unmake_move);
+    # _undo_sp is the stack pointer, so push/pop never reallocate the list.
+    _undo_stack: List[Tuple[int, int, int, int]] = field(
+        default_factory=list, repr=False, compare=False
+    )
+    _undo_sp: int = field(default=0, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.hash is None:
+            h = _ZOBRIST_TURN if self.turn else 0
+            for i, count in enumerate(self.pits):
+                h ^= _ZOBRIST[i][count]
+            self.hash = h
+        if self._nonempty_mask is None:
+            mask = 0
+            for i, count in enumerate(self.pits):
+                if count:
+                    mask |= 1 << i
+            self._nonempty_mask = mask
 
     # ─────────── placeholders ───────────
     def generate_legal_moves(self) -> List[int]:
         """Return list of pit indices that represent legal moves."""
         # TODO: implement real rules
-        return [i for i in range(9) if self.pits[i] > 0] if self.turn == 0 else [
-            i for i in range(9, 18) if self.pits[i] > 0
-        ]
+        if self._legal_cache is None:
+            m = self._nonempty_mask & (0x1FF if self.turn == 0 else 0x1FF << 9)
+            self._legal_cache = _legal_moves_kernel(m)
+        return self._legal_cache
 
     def apply_move(self, pit_index: int) -> "ToguzBoard":
         """Return *new* board after play ― **does not mutate self**."""
-        # TODO: implement sowing & capture rules
-        new_board = copy.deepcopy(self)
+        new_board = self.copy()
+        _apply_move_kernel(new_board.pits, pit_index)
+        new_board._account_changes(self.pits)
         new_board.turn ^= 1
-        # Very naïve placeholder mechanics
-        new_board.pits[pit_index] = 0
         return new_board
 
+    def _account_changes(self, before: bytearray) -> None:
+        """Fold pit-count changes since *before* into hash and nonempty mask.
+
+        Sowing touches a handful of pits that may wrap past the source, so a
+        single compare pass is the simplest way to keep both incremental
+        structures exact.  Also accounts for the side-to-move flip.
+        """
+        h = _ZOBRIST_TURN
+        mask = self._nonempty_mask
+        for i in range(18):
+            old, new = before[i], self.pits[i]
+            if old != new:
+                h ^= _ZOBRIST[i][old] ^ _ZOBRIST[i][new]
+                if (old == 0) != (new == 0):
+                    mask ^= 1 << i
+        self.hash ^= h
+        self._nonempty_mask = mask
+        self._legal_cache = None
+
+    def is_legal(self, pit_index: int) -> bool:
+        """O(1) legality test against the nonempty mask — no list needed."""
+        if (pit_index < 9) != (self.turn == 0):
+            return False
+        return bool(self._nonempty_mask & (1 << pit_index))
+
+    def move_diff(self, pit_index: int) -> Tuple[int, int, int, int]:
+        """Return the reversible delta that playing *pit_index* would cause.
+
+        Layout: ``(pit_index, old_pit_value, kazan_delta_cur, kazan_delta_opp)``
+        — enough to undo the move without snapshotting the whole board.
+        """
+        # TODO: fill in kazan deltas once capture rules are implemented
+        return (pit_index, self.pits[pit_index], 0, 0)
+
+    def undo(self, diff: Tuple[int, int, int, int]) -> None:
+        """Reverse a move **in place**, given the diff from :meth:`move_diff`."""
+        pit_index, old_value, kazan_cur, kazan_opp = diff
+        before = self.pits[:]
+        _undo_move_kernel(self.pits, pit_index, old_value)
+        self._account_changes(before)
+        self.kazans = (self.kazans[0] - kazan_cur, self.kazans[1] - kazan_opp)
+        self.turn ^= 1
+
+    # Search helpers ----------------------------------------------------------
+    def reserve(self, depth: int) -> None:
+        """Preallocate the undo stack for a search of up to *depth* plies.
+
+        Lets make_move push by plain index assignment instead of paying
+        list‑append resize churn in the search's inner loop.
+        """
+        grow = depth - len(self._undo_stack)
+        if grow > 0:
+            self._undo_stack.extend([(0, 0, 0, 0)] * grow)
+
+    def make_move(self, pit_index: int) -> None:
+        """Apply a move **in place**, pushing its diff for :meth:`unmake_move`."""
+        if self._undo_sp == len(self._undo_stack):
+            self._undo_stack.append((0, 0, 0, 0))
+        self._undo_stack[self._undo_sp] = self.move_diff(pit_index)
+        self._undo_sp += 1
+
+        before = self.pits[:]
+        _apply_move_kernel(self.pits, pit_index)
+        self._account_changes(before)
+        self.turn ^= 1
+
+    def unmake_move(self) -> None:
+        """Pop the newest diff and restore the previous position in place."""
+        self._undo_sp -= 1
+        self.undo(self._undo_stack[self._undo_sp])
+
     # Convenience helpers -----------------------------------------------------
     def copy(self) -> "ToguzBoard":
-        return copy.deepcopy(self)
+        # `pits` is the only mutable field; `kazans` is a tuple and `turn` an
+        # int, so a slice copy of the pit list is a full snapshot.
+        return ToguzBoard(
+            self.pits[:],
+            self.kazans,
+            self.turn,
+            hash=self.hash,
+            _nonempty_mask=self._nonempty_mask,
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class MoveRecord:
     ply: int
     notation: str
-    board_snapshot: ToguzBoard
+    move_index: int
+    prev_state_diff: Tuple[int, int, int, int]
 
 
 class MoveHistory:
@@ -88,16 +265,23 @@ class MoveHistory:
         self._records: List[MoveRecord] = []
 
     # API ---------------------------------------------------------------------
-    def add(self, notation: str, board_snapshot: ToguzBoard) -> None:
+    def add(self, notation: str, move_index: int,
+            diff: Tuple[int, int, int, int]) -> None:
         self._records.append(
-            MoveRecord(len(self._records) + 1, notation, board_snapshot.copy())
+            MoveRecord(len(self._records) + 1, notation, move_index, diff)
         )
 
     def rewind_to(self, ply: int) -> ToguzBoard:
-        """Return the board *before* the given ply (1‑based)."""
-        if ply == 0:
-            return ToguzBoard()
-        return self._records[ply - 1].board_snapshot.copy()
+        """Return the board after the given ply (1‑based; 0 = initial).
+
+        Replays the first *ply* recorded moves from the starting position —
+        with the snapshot‑free apply_move this is cheaper than one of the
+        old deep copies, and it cannot drift from the diff log.
+        """
+        board = ToguzBoard()
+        for rec in self._records[:ply]:
+            board = board.apply_move(rec.move_index)
+        return board
 
     # Table helpers -----------------------------------------------------------
     @property
@@ -113,6 +297,16 @@ class MoveHistory:
 # ──────────────────────────────────────────────────────────────────────────────
 
 
+@functools.lru_cache(maxsize=16)
+def _font_for(size: int):
+    """Return a shared Helvetica Font object for *size*.
+
+    tkinter resolves a ``("Helvetica", n)`` tuple into a font on every call;
+    caching the Font object avoids that lookup on each text item we create.
+    """
+    return tkfont.Font(family="Helvetica", size=size)
+
+
 class GameUI:
     BOARD_BG = "#EEE0CB"
     PIT_BG = "#9F6F43"
@@ -128,6 +322,23 @@ class GameUI:
 
         self.board_model = ToguzBoard()
         self.history = MoveHistory()
+        # Mirror of the table rows so each move appends one row instead of
+        # rebuilding the whole list from the history.
+        self._table_rows: List[List] = []
+
+        # Layout geometry, recomputed only when the canvas size changes.
+        self._pit_r: float = 0.0
+        self._pit_centers: List[Tuple[float, float]] = []
+        self._geom_size: Optional[Tuple[int, int]] = None
+
+        # Canvas item ids, created once and reconfigured on later redraws.
+        self._pit_circle_ids: List[int] = []
+        self._pit_text_ids: List[int] = []
+        self._kazan_text_ids: List[int] = []
+
+        # What is currently on screen, for dirty-only redraws.
+        self._last_drawn_pits: Optional[bytearray] = None
+        self._last_drawn_kazans: Optional[Tuple[int, int]] = None
 
         self._setup_layout()
         self._draw_board()
@@ -175,74 +386,151 @@ class GameUI:
         total_width = self.window.size[0]
         self.window["-TABLE-"].Widget.master.config(width=int(total_width * 0.3))
 
+        # Track the canvas size via <Configure> so the draw/hit-test paths
+        # never have to round-trip into tkinter for it.
+        self.board_area.TKCanvas.bind("<Configure>", self._on_resize)
+        self._recompute_geometry(*self.board_area.get_size())
+
     # Board drawing -----------------------------------------------------------
+    def _recompute_geometry(self, w: int, h: int):
+        """Derive pit radius and the 18 pit centres for a canvas of w×h."""
+        pit_r = min(w / 18, h / 4) * 0.9  # radius heuristics
+        centers = []
+        # Bottom row (current player side)
+        for i in range(9):
+            centers.append(((i + 0.5) * 2 * pit_r, pit_r * 1.5))
+        # Top row (opponent side) – reversed for natural orientation
+        for i in range(9):
+            centers.append(((8 - i + 0.5) * 2 * pit_r, h - pit_r * 1.5))
+        self._pit_r = pit_r
+        self._pit_centers = centers
+        self._geom_size = (w, h)
+
+    def _on_resize(self, event):
+        """<Configure> handler: refresh cached geometry and rebuild items."""
+        if event.width < 50 or event.height < 50:
+            # Degenerate sizes show up transiently during finalize and when
+            # minimized; keep the last sane geometry instead.
+            return
+        if (event.width, event.height) == self._geom_size:
+            return
+        self._recompute_geometry(event.width, event.height)
+        self._rebuild_board_items()
+
     def _draw_board(self):
         g = self.board_area
-        g.erase()
 
-        w, h = g.get_size()
-        pit_r = min(w / 18, h / 4) * 0.9  # radius heuristics
+        if self._geom_size is None:
+            return
+        w, h = self._geom_size
+        if w < 50 or h < 50:
+            return
 
-        def draw_pit(idx: int, x: float, y: float, count: int):
-            g.draw_circle((x, y), pit_r, fill_color=self.PIT_BG, line_color="black", line_width=2)
-            g.draw_text(str(count), (x, y), color=self.TEXT_COL, font=("Helvetica", int(pit_r)))
+        if not self._pit_text_ids:
+            self._rebuild_board_items()
+            return
 
-        # Bottom row (current player side)
-        for i in range(9):
-            cx = (i + 0.5) * 2 * pit_r
-            cy = pit_r * 1.5
-            draw_pit(i, cx, cy, self.board_model.pits[i])
+        # Nothing changed since the last draw — don't touch the canvas.
+        if (
+            self._last_drawn_pits == self.board_model.pits
+            and self._last_drawn_kazans == self.board_model.kazans
+        ):
+            return
 
-        # Top row (opponent side) – reversed for natural orientation
-        for i in range(9):
-            cx = (8 - i + 0.5) * 2 * pit_r
-            cy = h - pit_r * 1.5
-            draw_pit(9 + i, cx, cy, self.board_model.pits[9 + i])
+        # Items already exist — update only the counts that changed since the
+        # last draw.  A typical move touches a couple of pits, so this does
+        # ~2 itemconfig calls instead of 20.
+        tkc = g.TKCanvas
+        pits = self.board_model.pits
+        kazans = self.board_model.kazans
+        for idx, text_id in enumerate(self._pit_text_ids):
+            if self._last_drawn_pits[idx] != pits[idx]:
+                tkc.itemconfig(text_id, text=str(pits[idx]))
+        for i, text_id in enumerate(self._kazan_text_ids):
+            if self._last_drawn_kazans[i] != kazans[i]:
+                tkc.itemconfig(text_id, text=str(kazans[i]))
+        self._last_drawn_pits = pits[:]
+        self._last_drawn_kazans = kazans
+
+    def _rebuild_board_items(self):
+        """Create every canvas item from scratch (first draw and resizes)."""
+        g = self.board_area
+        g.erase()
+
+        w, h = self._geom_size
+        pit_r = self._pit_r
+
+        self._pit_circle_ids = []
+        self._pit_text_ids = []
+        for idx, (cx, cy) in enumerate(self._pit_centers):
+            self._pit_circle_ids.append(
+                g.draw_circle((cx, cy), pit_r, fill_color=self.PIT_BG, line_color="black", line_width=2)
+            )
+            self._pit_text_ids.append(
+                g.draw_text(str(self.board_model.pits[idx]), (cx, cy), color=self.TEXT_COL, font=_font_for(int(pit_r)))
+            )
 
         # Kazans (stores)
         g.draw_rectangle((w - 2.5 * pit_r, h / 2 - 2 * pit_r), (w - 0.5 * pit_r, h / 2 + 2 * pit_r), fill_color="#D4C09B", line_color="black", line_width=2)
-        g.draw_text(str(self.board_model.kazans[0]), (w - 1.5 * pit_r, h / 2 + pit_r * 1.2), font=("Helvetica", int(pit_r * 0.9)))
-        g.draw_text(str(self.board_model.kazans[1]), (w - 1.5 * pit_r, h / 2 - pit_r * 1.2), font=("Helvetica", int(pit_r * 0.9)))
+        self._kazan_text_ids = [
+            g.draw_text(str(self.board_model.kazans[0]), (w - 1.5 * pit_r, h / 2 + pit_r * 1.2), font=_font_for(int(pit_r * 0.9))),
+            g.draw_text(str(self.board_model.kazans[1]), (w - 1.5 * pit_r, h / 2 - pit_r * 1.2), font=_font_for(int(pit_r * 0.9))),
+        ]
 
-    def _screen_to_pit(self, x: int, y: int) -> int | None:
-        """Return pit index if click is inside a pit, else None."""
-        w, h = self.board_area.get_size()
-        pit_r = min(w / 18, h / 4) * 0.9
+        self._last_drawn_pits = self.board_model.pits[:]
+        self._last_drawn_kazans = self.board_model.kazans
 
-        # Bottom row detection
-        for i in range(9):
-            cx = (i + 0.5) * 2 * pit_r
-            cy = pit_r * 1.5
-            if (x - cx) ** 2 + (y - cy) ** 2 <= pit_r ** 2:
-                return i
-        # Top row
-        for i in range(9):
-            cx = (8 - i + 0.5) * 2 * pit_r
-            cy = h - pit_r * 1.5
-            if (x - cx) ** 2 + (y - cy) ** 2 <= pit_r ** 2:
-                return 9 + i
+    def _screen_to_pit(self, x: int, y: int) -> int | None:
+        """Return pit index if click is inside a pit, else None.
+
+        The pits form a 2×9 grid, so one divmod picks the only candidate
+        column and a single distance test confirms — no need to scan all 18.
+        """
+        if not self._pit_centers:
+            return None
+        pit_r = self._pit_r
+        col = int(x // (2 * pit_r))
+        if not 0 <= col <= 8:
+            return None
+        _, h = self._geom_size
+        # Bottom row holds pits 0‥8 left-to-right; top row is mirrored.
+        idx = col if y < h / 2 else 9 + (8 - col)
+        cx, cy = self._pit_centers[idx]
+        if (x - cx) ** 2 + (y - cy) ** 2 <= pit_r ** 2:
+            return idx
         return None
 
     # History helpers ---------------------------------------------------------
-    def _push_history(self, move_notation: str):
-        self.history.add(move_notation, self.board_model)
-        self.table.update(values=self.history.as_table())
+    def _push_history(self, move_notation: str, move_index: int,
+                      diff: Tuple[int, int, int, int]):
+        self.history.add(move_notation, move_index, diff)
+        self._table_rows.append([len(self._table_rows) + 1, move_notation])
+        self.table.update(values=self._table_rows)
 
     # Engine stub -------------------------------------------------------------
     def _engine_move(self):
-        """Very naïve AI placeholder – just picks first legal move."""
-        legal = self.board_model.generate_legal_moves()
-        if not legal:
-            sg.popup("Game over!", keep_on_top=True)
-            return
-        chosen = legal[0]
-        self._apply_move(chosen, by_engine=True)
+        """Launch the engine on a worker thread so the UI never freezes.
+
+        The thread searches a private board copy and reports its choice back
+        through ``write_event_value``; the main loop applies it on the
+        ``-ENGINE-DONE-`` event.
+        """
+        board = self.board_model.copy()
+
+        def search():
+            # Very naïve AI placeholder – just picks first legal move.
+            legal = board.generate_legal_moves()
+            chosen = legal[0] if legal else None
+            self.window.write_event_value("-ENGINE-DONE-", chosen)
+
+        threading.Thread(target=search, daemon=True).start()
 
     # Generic move application ------------------------------------------------
     def _apply_move(self, pit_index: int, by_engine: bool = False):
         move_str = f"{'AI' if by_engine else 'P'}:{pit_index + 1}"
+        diff = self.board_model.move_diff(pit_index)
         self.board_model = self.board_model.apply_move(pit_index)
-        self._push_history(move_str)
+        self._push_history(move_str, pit_index, diff)
         self._draw_board()
 
         # If player move ― launch AI reply
@@ -252,7 +540,9 @@ class GameUI:
     # Main loop ---------------------------------------------------------------
     def run(self):
         while True:
-            event, values = self.window.read(timeout=100)
+            # Block until a real event — no animation or periodic work needs
+            # a poll tick, so don't wake the interpreter ten times a second.
+            event, values = self.window.read()
             if event in (sg.WINDOW_CLOSED, "Exit"):
                 break
 
@@ -260,16 +550,25 @@ class GameUI:
             if event == "-BOARD-":
                 x, y = values["-BOARD-"]
                 pit = self._screen_to_pit(x, y)
-                if pit is not None and pit in self.board_model.generate_legal_moves():
+                if pit is not None and self.board_model.is_legal(pit):
                     self._apply_move(pit)
 
+            # Engine finished its search on the worker thread
+            if event == "-ENGINE-DONE-":
+                chosen = values[event]
+                if chosen is None:
+                    sg.popup("Game over!", keep_on_top=True)
+                else:
+                    self._apply_move(chosen, by_engine=True)
+
             # Click on move table -> rewind
             if event == "-TABLE-" and values["-TABLE-"]:
                 row_idx = values["-TABLE-"][0]
                 self.board_model = self.history.rewind_to(row_idx)
                 # Trim history to that ply
                 self.history._records = self.history._records[:row_idx]
-                self.table.update(values=self.history.as_table())
+                self._table_rows = self._table_rows[:row_idx]
+                self.table.update(values=self._table_rows)
                 self._draw_board()
 
         self.window.close()
@@ -287,11 +586,11 @@ def main():
 
 
 if __name__ == "__main__":
-    if sys.version_info < (3, 9):
+    if sys.version_info < (3, 10):  # dataclass(slots=True) needs 3.10
         if sg is not None:
-            sg.popup_error("Python 3.9+ is required.")
+            sg.popup_error("Python 3.10+ is required.")
         else:
-            print("Python 3.9+ is required.", file=sys.stderr)
+            print("Python 3.10+ is required.", file=sys.stderr)
         sys.exit(1)
     if sg is None:
         print("PySimpleGUI is required to run this application.", file=sys.stderr)